@@ -17,28 +17,32 @@ The bot runs as part of a pipeline that processes audio/video frames and manages
 the conversation flow.
 """
 
+import asyncio
+import concurrent.futures
+import copy
+import functools
 import os
-from typing import List
+import struct
+from typing import List, Optional, Tuple
 
 from dotenv import load_dotenv
 from loguru import logger
-from PIL import Image
 from pipecat.adapters.schemas.function_schema import FunctionSchema
 from pipecat.adapters.schemas.tools_schema import ToolsSchema
 from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.frames.frames import (
     BotStartedSpeakingFrame,
     BotStoppedSpeakingFrame,
-    Frame,
     OutputImageRawFrame,
     SpriteFrame,
     TTSSpeakFrame,
 )
+from pipecat.observers.base_observer import FramePushed
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
 from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
-from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.processors.frame_processor import FrameProcessor
 from pipecat.processors.frameworks.rtvi import RTVIConfig, RTVIObserver, RTVIProcessor
 from pipecat.services.cartesia.tts import CartesiaTTSService
 from pipecat.services.openai.llm import OpenAILLMService
@@ -59,62 +63,235 @@ IS_LOCAL_RUN = os.environ.get("LOCAL_RUN", "0") == "1"
 # Logger for local dev
 # logger.add(sys.stderr, level="DEBUG")
 
-sprites = []
 script_dir = os.path.dirname(__file__)
+assets_dir = os.path.join(script_dir, "assets")
+SPRITE_PATHS = [f"{assets_dir}/robot0{i}.png" for i in range(1, 26)]
+SPRITE_PACK_PATH = f"{assets_dir}/sprites.rawpack"
 
-# Load sequential animation frames
-for i in range(1, 26):
-    # Build the full path to the image file
-    full_path = os.path.join(script_dir, f"assets/robot0{i}.png")
-    # Get the filename without the extension to use as the dictionary key
-    # Open the image and convert it to bytes
-    with Image.open(full_path) as img:
-        sprites.append(
-            OutputImageRawFrame(image=img.tobytes(), size=img.size, format=img.format)
+# Sprite pack header: magic, frame count, width, height, mode, format.
+# Must match tools/pack_sprites.py, which builds the pack.
+SPRITE_PACK_HEADER = struct.Struct("<4sIII8s8s")
+SPRITE_PACK_MAGIC = b"SPRK"
+
+# Bytes per pixel of the Pillow image modes a sprite pack may hold
+SPRITE_MODE_BYTES = {"L": 1, "P": 1, "LA": 2, "RGB": 3, "RGBA": 4}
+
+
+def _decode_one(path: str) -> Tuple[bytes, Tuple[int, int], str]:
+    """Decode a single sprite PNG into raw bytes.
+
+    Args:
+        path: Path to the PNG file
+
+    Returns:
+        Tuple[bytes, Tuple[int, int], str]: The raw image bytes, size and format.
+    """
+    # Pillow is only needed when the sprite pack is missing or out of date
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img.load()
+        return (img.tobytes(), img.size, img.format)
+
+
+def _sprite_pack_is_fresh() -> bool:
+    """Whether the sprite pack exists and is newer than every sprite PNG."""
+    try:
+        pack_mtime = os.path.getmtime(SPRITE_PACK_PATH)
+        return all(os.path.getmtime(path) <= pack_mtime for path in SPRITE_PATHS)
+    except OSError:
+        return False
+
+
+def _read_sprite_pack(count: Optional[int] = None) -> List[OutputImageRawFrame]:
+    """Read raw frames from the sprite pack built by tools/pack_sprites.py.
+
+    Args:
+        count: Number of frames to read, all frames if None
+
+    Returns:
+        List[OutputImageRawFrame]: The animation frames in playback order.
+    """
+    with open(SPRITE_PACK_PATH, "rb") as f:
+        magic, total, width, height, mode, fmt = SPRITE_PACK_HEADER.unpack(
+            f.read(SPRITE_PACK_HEADER.size)
         )
+        mode = mode.rstrip(b"\0").decode()
+        if magic != SPRITE_PACK_MAGIC or total == 0 or mode not in SPRITE_MODE_BYTES:
+            raise ValueError(f"Invalid sprite pack {SPRITE_PACK_PATH}")
+
+        frame_size = width * height * SPRITE_MODE_BYTES[mode]
+        if os.fstat(f.fileno()).st_size - SPRITE_PACK_HEADER.size != total * frame_size:
+            raise ValueError(f"Truncated or corrupt sprite pack {SPRITE_PACK_PATH}")
+
+        fmt = fmt.rstrip(b"\0").decode()
+        # Each frame gets its own bytes, read straight from the file
+        return [
+            OutputImageRawFrame(image=f.read(frame_size), size=(width, height), format=fmt)
+            for _ in range(total if count is None else min(count, total))
+        ]
+
+
+def _load_sprites() -> List[OutputImageRawFrame]:
+    """Load the sequential animation frames.
+
+    Frames are read from the pre-decoded sprite pack. If the pack is missing or
+    older than the PNGs, the PNGs are decoded with Pillow instead.
+
+    Returns:
+        List[OutputImageRawFrame]: The animation frames in playback order.
+    """
+    if _sprite_pack_is_fresh():
+        return _read_sprite_pack()
+
+    logger.warning("Sprite pack missing or stale, run tools/pack_sprites.py to rebuild it")
+    # Overlap file reads with PNG decoding, map() preserves the frame order
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        entries = list(executor.map(_decode_one, SPRITE_PATHS))
+
+    return [
+        OutputImageRawFrame(image=image, size=size, format=fmt)
+        for image, size, fmt in entries
+    ]
 
-# Create a smooth animation by adding reversed frames
-flipped = sprites[::-1]
-sprites.extend(flipped)
 
-# Define static and animated states
-quiet_frame = sprites[0]  # Static frame for when bot is listening
-talking_frame = SpriteFrame(
-    images=sprites
-)  # Animation sequence for when bot is talking
+# Static frame for when bot is listening. Only this frame is decoded at import,
+# the talking animation is decoded the first time the bot speaks.
+if _sprite_pack_is_fresh():
+    quiet_frame = _read_sprite_pack(count=1)[0]
+else:
+    image, size, fmt = _decode_one(SPRITE_PATHS[0])
+    quiet_frame = OutputImageRawFrame(image=image, size=size, format=fmt)
 
 
-class TalkingAnimation(FrameProcessor):
-    """Manages the bot's visual animation states.
+class TalkingAnimationObserver(RTVIObserver):
+    """RTVI observer that also manages the bot's visual animation states.
 
     Switches between static (listening) and animated (talking) states based on
-    the bot's current speaking status.
+    the bot's current speaking status. The animation frames are queued straight
+    into the output transport, so no extra processor sits in the pipeline.
     """
 
-    def __init__(self):
-        super().__init__()
+    # Animation sequence for when bot is talking, shared by all instances
+    _talking_frame: Optional[SpriteFrame] = None
+    # Serializes the first decode, created on first use inside the event loop
+    _decode_lock: Optional[asyncio.Lock] = None
+
+    def __init__(self, rtvi: RTVIProcessor, output: FrameProcessor):
+        super().__init__(rtvi)
+        self._output = output
         self._is_talking = False
+        # Exact-type dispatch keeps the common case (audio/text/image) to one lookup
+        self._handlers = {
+            BotStartedSpeakingFrame: self._on_start,
+            BotStoppedSpeakingFrame: self._on_stop,
+        }
 
-    async def process_frame(self, frame: Frame, direction: FrameDirection):
-        """Process incoming frames and update animation state.
+    @classmethod
+    def _decode(cls) -> SpriteFrame:
+        """Decode the talking animation if needed and return it.
 
-        Args:
-            frame: The incoming frame to process
-            direction: The direction of frame flow in the pipeline
+        Blocks while decoding, so only call it outside the event loop or at startup.
+
+        Returns:
+            SpriteFrame: The shared talking animation.
         """
-        await super().process_frame(frame, direction)
-
-        # Switch to talking animation when bot starts speaking
-        if isinstance(frame, BotStartedSpeakingFrame):
-            if not self._is_talking:
-                await self.push_frame(talking_frame)
-                self._is_talking = True
-        # Return to static frame when bot stops speaking
-        elif isinstance(frame, BotStoppedSpeakingFrame):
-            await self.push_frame(quiet_frame)
+        if cls._talking_frame is None:
+            sprites = _load_sprites()
+            # Create a smooth ping-pong animation by replaying the inner frames in
+            # reverse. The tail reuses the same frame objects instead of new ones.
+            cls._talking_frame = SpriteFrame(images=sprites + sprites[-2:0:-1])
+        return cls._talking_frame
+
+    @classmethod
+    async def _ensure_decoded(cls) -> SpriteFrame:
+        """Decode the talking animation on first use and return it.
+
+        The decode runs in a worker thread, so other sessions sharing the event
+        loop keep streaming while it happens.
+
+        Returns:
+            SpriteFrame: The shared talking animation.
+        """
+        if cls._talking_frame is None:
+            if cls._decode_lock is None:
+                cls._decode_lock = asyncio.Lock()
+            async with cls._decode_lock:
+                await asyncio.to_thread(cls._decode)
+        return cls._talking_frame
+
+    async def _on_start(self):
+        """Switch to talking animation when bot starts speaking."""
+        if not self._is_talking:
+            self._is_talking = True
+            talking_frame = await self._ensure_decoded()
+            # The bot may have stopped speaking while the animation was decoding
+            if self._is_talking:
+                await self._output.queue_frame(talking_frame)
+
+    async def _on_stop(self):
+        """Return to static frame when bot stops speaking."""
+        if self._is_talking:
+            await self._output.queue_frame(quiet_frame)
             self._is_talking = False
 
-        await self.push_frame(frame, direction)
+    async def on_push_frame(self, data: FramePushed, _type=type):
+        """Handle RTVI events and update animation state for a pushed frame.
+
+        The same speaking frame is observed at every hop it makes, the talking
+        state makes sure each transition is only acted on once.
+
+        Args:
+            data: The pushed frame and its source and destination processors
+            _type: Bound to the ``type`` builtin so the per-frame lookup is a local
+        """
+        await super().on_push_frame(data)
+
+        handler = self._handlers.get(_type(data.frame))
+        if handler is not None:
+            await handler()
+
+
+@functools.lru_cache(maxsize=1)
+def _krisp():
+    """Import the Krisp filter once per process.
+
+    Krisp is only available in production, so the import is deferred until the
+    first session needs it. Each session still gets its own filter instance, as
+    the filter holds per-session noise cancellation state.
+
+    Returns:
+        type: The KrispFilter class.
+    """
+    from pipecat.audio.filters.krisp_filter import KrispFilter
+
+    return KrispFilter
+
+
+@functools.lru_cache(maxsize=1)
+def _silero_vad() -> SileroVADAnalyzer:
+    """Load the Silero VAD model once per process.
+
+    Returns:
+        SileroVADAnalyzer: Analyzer used as a template for per-session analyzers.
+    """
+    return SileroVADAnalyzer()
+
+
+def _new_vad_analyzer() -> SileroVADAnalyzer:
+    """Create a Silero VAD analyzer for a new session.
+
+    The ONNX inference session holding the model weights is shared between
+    sessions, only the model's recurrent state is reset for each new analyzer.
+
+    Returns:
+        SileroVADAnalyzer: A fresh analyzer backed by the shared model weights.
+    """
+    template = _silero_vad()
+    analyzer = copy.copy(template)
+    analyzer._model = copy.copy(template._model)
+    analyzer._model.reset_states()
+    return analyzer
 
 
 async def fetch_weather_from_api(
@@ -129,7 +306,36 @@ async def fetch_weather_from_api(
     await result_callback({"conditions": "nice", "temperature": "75"})
 
 
-async def main(room_url: str, token: str, config: dict):
+# Define your function call using the FunctionSchema
+# Learn more about function calling in Pipecat:
+# https://docs.pipecat.ai/guides/features/function-calling
+WEATHER_FUNCTION = FunctionSchema(
+    name="get_current_weather",
+    description="Get the current weather",
+    properties={
+        "location": {
+            "type": "string",
+            "description": "The city and state, e.g. San Francisco, CA",
+        },
+        "format": {
+            "type": "string",
+            "enum": ["celsius", "fahrenheit"],
+            "description": "The temperature unit to use. Infer this from the user's location.",
+        },
+    },
+    required=["location", "format"],
+)
+
+# Set up the tools schema with your weather function call
+TOOLS = ToolsSchema(standard_tools=[WEATHER_FUNCTION])
+
+SYSTEM_MESSAGE = ChatCompletionSystemMessageParam(
+    role="system",
+    content="You are Chatbot, a friendly, helpful robot. Your goal is to demonstrate your capabilities in a succinct way. Your output will be converted to audio so don't include special characters in your answers. Respond to what the user said in a creative and helpful way, but keep your responses brief. Start by introducing yourself.",
+)
+
+
+async def main(room_url: str, token: str, config: dict, handle_sigint: bool = True):
     """Main bot execution function.
 
     Sets up and runs the bot pipeline including:
@@ -141,9 +347,6 @@ async def main(room_url: str, token: str, config: dict):
     """
     logger.info(f"Body: {config}")
 
-    if not IS_LOCAL_RUN:
-        from pipecat.audio.filters.krisp_filter import KrispFilter
-
     transport = DailyTransport(
         room_url,
         token,
@@ -152,13 +355,13 @@ async def main(room_url: str, token: str, config: dict):
             audio_in_enabled=True,  # Enable input audio for the bot
             audio_in_filter=None
             if IS_LOCAL_RUN
-            else KrispFilter(),  # Only use Krisp in production
+            else _krisp()(),  # Only use Krisp in production
             audio_out_enabled=True,  # Enable output audio for the bot
             video_out_enabled=True,  # Enable the video output for the bot
             video_out_width=1024,  # Set the video output width
             video_out_height=576,  # Set the video output height
             transcription_enabled=False,  # Disable transcription for the user, use Soniox instead
-            vad_analyzer=SileroVADAnalyzer(),  # Use the Silero VAD analyzer
+            vad_analyzer=_new_vad_analyzer(),  # Use the Silero VAD analyzer
         ),
     )
 
@@ -186,45 +389,16 @@ async def main(room_url: str, token: str, config: dict):
     # Register your function call providing the function name and callback
     llm.register_function("get_current_weather", fetch_weather_from_api)
 
-    # Define your function call using the FunctionSchema
-    # Learn more about function calling in Pipecat:
-    # https://docs.pipecat.ai/guides/features/function-calling
-    weather_function = FunctionSchema(
-        name="get_current_weather",
-        description="Get the current weather",
-        properties={
-            "location": {
-                "type": "string",
-                "description": "The city and state, e.g. San Francisco, CA",
-            },
-            "format": {
-                "type": "string",
-                "enum": ["celsius", "fahrenheit"],
-                "description": "The temperature unit to use. Infer this from the user's location.",
-            },
-        },
-        required=["location", "format"],
-    )
-
-    # Set up the tools schema with your weather function call
-    tools = ToolsSchema(standard_tools=[weather_function])
-
-    # Set up initial messages for the bot
-    messages: List[ChatCompletionMessageParam] = [
-        ChatCompletionSystemMessageParam(
-            role="system",
-            content="You are Chatbot, a friendly, helpful robot. Your goal is to demonstrate your capabilities in a succinct way. Your output will be converted to audio so don't include special characters in your answers. Respond to what the user said in a creative and helpful way, but keep your responses brief. Start by introducing yourself.",
-        )
-    ]
+    # Set up initial messages for the bot. The system message itself is shared,
+    # but each session gets its own list for the context to append to.
+    messages: List[ChatCompletionMessageParam] = [SYSTEM_MESSAGE]
 
     # Set up conversation context and management
     # The context_aggregator will automatically collect conversation context
     # Pass your initial messages and tools to the context to initialize the context
-    context = OpenAILLMContext(messages, tools)
+    context = OpenAILLMContext(messages, TOOLS)
     context_aggregator = llm.create_context_aggregator(context)
 
-    ta = TalkingAnimation()
-
     # RTVI events for Pipecat client UI
     rtvi = RTVIProcessor(config=RTVIConfig(config=[]))
 
@@ -237,7 +411,6 @@ async def main(room_url: str, token: str, config: dict):
             context_aggregator.user(),
             llm,
             tts,
-            ta,
             transport.output(),
             context_aggregator.assistant(),
         ]
@@ -251,7 +424,7 @@ async def main(room_url: str, token: str, config: dict):
             enable_metrics=True,
             enable_usage_metrics=True,
         ),
-        observers=[RTVIObserver(rtvi)],
+        observers=[TalkingAnimationObserver(rtvi, transport.output())],
     )
 
     @rtvi.event_handler("on_client_ready")
@@ -274,12 +447,12 @@ async def main(room_url: str, token: str, config: dict):
         # Cancel the PipelineTask to stop processing
         await task.cancel()
 
-    runner = PipelineRunner()
+    runner = PipelineRunner(handle_sigint=handle_sigint)
 
     await runner.run(task)
 
 
-async def bot(args: DailySessionArguments):
+async def bot(args: DailySessionArguments, handle_sigint: bool = True):
     """Main bot entry point compatible with Pipecat Cloud.
 
     Args:
@@ -287,11 +460,13 @@ async def bot(args: DailySessionArguments):
         token: The Daily room token
         body: The configuration object from the request body
         session_id: The session ID for logging
+        handle_sigint: Whether the pipeline runner installs its own SIGINT handler.
+            Disable it when running inside another server's event loop.
     """
     logger.info(f"Bot process initialized {args.room_url} {args.token}")
 
     try:
-        await main(args.room_url, args.token, args.body)
+        await main(args.room_url, args.token, args.body, handle_sigint=handle_sigint)
         logger.info("Bot process completed")
     except Exception as e:
         logger.exception(f"Error in bot process: {str(e)}")
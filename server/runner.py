@@ -6,9 +6,11 @@
 
 import argparse
 import asyncio
+import json
 import os
+import sys
 
-from bot import bot
+from bot import TalkingAnimationObserver, _silero_vad, bot
 from pipecatcloud.agent import DailySessionArguments
 
 
@@ -23,12 +25,31 @@ def main():
         required=False,
         help="Daily room token",
     )
+    parser.add_argument(
+        "--pool-worker",
+        action="store_true",
+        help="Warm up, then read the room URL and token as JSON from stdin",
+    )
 
     args, unknown = parser.parse_known_args()
 
     url = args.url or os.getenv("DAILY_SAMPLE_ROOM_URL")
     token = args.token or os.getenv("DAILY_SAMPLE_ROOM_TOKEN")
 
+    if args.pool_worker:
+        # Decode the talking animation and load the VAD model up front, so the
+        # session doesn't pay for them
+        TalkingAnimationObserver._decode()
+        _silero_vad()
+
+        # Block until the server hands this worker a session
+        line = sys.stdin.readline()
+        if not line:
+            return
+        session = json.loads(line)
+        url = session["room_url"]
+        token = session["token"]
+
     if not url:
         raise Exception(
             "No Daily room specified. use the -u/--url option from the command line, or set DAILY_SAMPLE_ROOM_URL in your environment to specify a Daily room URL."
@@ -14,8 +14,14 @@ It includes:
 """
 
 import argparse
+import asyncio
+import collections
+import contextlib
+import json
 import os
-import subprocess
+import sys
+import time
+import uuid
 from contextlib import asynccontextmanager
 from typing import Any, Dict
 
@@ -24,6 +30,13 @@ from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
+from loguru import logger
+from pipecat.transports.services.helpers.daily_rest import (
+    DailyRESTHelper,
+    DailyRoomParams,
+    DailyRoomProperties,
+)
+from pipecatcloud.agent import DailySessionArguments
 
 # Load environment variables from .env file
 load_dotenv(override=True)
@@ -31,29 +44,248 @@ load_dotenv(override=True)
 # Set LOCAL_RUN environment variable for local development
 os.environ["LOCAL_RUN"] = "1"
 
-# Dictionary to track bot processes: {pid: (process, room_url)}
+# Imported after LOCAL_RUN is set, as the bot reads it at import time
+from bot import TalkingAnimationObserver, _silero_vad, bot  # noqa: E402
+
+# Dictionary to track bots: {pid: (process, room_url)} in multiproc mode,
+# {id(task): (task, room_url)} otherwise
 bot_procs = {}
 
 # Store Daily API helpers
 daily_helpers = {}
 
+# Daily meeting tokens we request expire after this long
+TOKEN_EXPIRY_SECS = 60 * 60
+
+# Pooled rooms are discarded once their token is this close to expiring
+TOKEN_EXPIRY_MARGIN_SECS = 10 * 60
+
+# Number of rooms and tokens to create ahead of time
+ROOM_POOL_SIZE = int(os.getenv("DAILY_ROOM_POOL_SIZE", "4"))
+
+# Delay before retrying after a failed room pre-creation, doubled after each
+# consecutive failure up to the maximum
+ROOM_POOL_RETRY_SECS = 5
+ROOM_POOL_MAX_RETRY_SECS = 5 * 60
+
+# Pre-started runner processes waiting on stdin for a session (multiproc mode only)
+warm_procs = []
+
+# Number of warm runner processes to keep ready in multiproc mode
+BOT_POOL_SIZE = int(os.getenv("BOT_POOL_SIZE", "2"))
+
+# Tasks waiting for bot processes to exit, referenced here so they aren't collected
+reapers = set()
+
+# Time bot processes get to exit after SIGTERM on shutdown before being killed
+CLEANUP_TIMEOUT_SECS = 5
+
+
+def _multiproc() -> bool:
+    """Whether bots run in their own subprocess instead of in the server process."""
+    return os.getenv("BOT_MULTIPROC", "0") == "1"
+
+
+# In-process bots all use this process's copy of the talking animation and the
+# Silero VAD model. Load them when the app is imported, so gunicorn --preload
+# workers inherit them copy-on-write and no session blocks the shared event loop
+# loading them. Skipped when run as a script, where the app is imported again by
+# uvicorn once the command line has been parsed.
+if __name__ != "__main__" and not _multiproc():
+    TalkingAnimationObserver._decode()
+    _silero_vad()
+
+
+async def _spawn_warm():
+    """Start a runner process that imports the bot and waits for a session."""
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "runner",
+        "--pool-worker",
+        env={**os.environ, "LOCAL_RUN": "1"},
+        stdin=asyncio.subprocess.PIPE,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    warm_procs.append(proc)
+
+
+async def _fill_warm_pool():
+    """Drop exited warm runners and start new ones until the pool is full."""
+    warm_procs[:] = [proc for proc in warm_procs if proc.returncode is None]
+    while len(warm_procs) < BOT_POOL_SIZE:
+        await _spawn_warm()
 
-def cleanup():
+
+def _take_warm():
+    """Take a live runner from the warm pool.
+
+    Returns:
+        asyncio.subprocess.Process | None: A warm runner process, or None if the pool is empty.
+    """
+    while warm_procs:
+        proc = warm_procs.pop(0)
+        if proc.returncode is None:
+            return proc
+    return None
+
+
+async def _reap(proc: asyncio.subprocess.Process):
+    """Stop tracking a bot process as soon as it exits.
+
+    Args:
+        proc: The bot process to wait for
+    """
+    await proc.wait()
+    bot_procs.pop(proc.pid, None)
+
+
+async def cleanup():
     """Cleanup function to terminate all bot processes.
 
-    Called during server shutdown.
+    Called during server shutdown. Processes are sent SIGTERM first and are
+    killed if they haven't exited after CLEANUP_TIMEOUT_SECS. In-process bots
+    are cancelled and given the same time to finish.
     """
-    for entry in bot_procs.values():
+    tasks = []
+    procs = list(warm_procs)
+    warm_procs.clear()
+    for entry in list(bot_procs.values()):
         proc = entry[0]
-        proc.terminate()
-        proc.wait()
+        if isinstance(proc, asyncio.Task):
+            tasks.append(proc)
+        else:
+            procs.append(proc)
+
+    for task in tasks:
+        task.cancel()
+
+    for proc in procs:
+        with contextlib.suppress(ProcessLookupError):
+            proc.terminate()
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(proc.wait() for proc in procs)),
+            timeout=CLEANUP_TIMEOUT_SECS,
+        )
+    except asyncio.TimeoutError:
+        for proc in procs:
+            if proc.returncode is None:
+                with contextlib.suppress(ProcessLookupError):
+                    proc.kill()
+
+    # Stop waiting for processes that are gone or were just killed
+    for reaper in list(reapers):
+        reaper.cancel()
+    await asyncio.gather(*reapers, return_exceptions=True)
+
+    # Give cancelled bots the same time to tear down their pipelines, without
+    # letting one that hangs block the shutdown
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=CLEANUP_TIMEOUT_SECS)
+        if pending:
+            logger.warning(f"{len(pending)} bot(s) did not stop within {CLEANUP_TIMEOUT_SECS}s")
+
+
+async def _create_room() -> tuple[str, str]:
+    """Create a new Daily room and generate an authentication token for it.
+
+    Returns:
+        tuple[str, str]: A tuple containing the room URL and the authentication token.
+
+    Raises:
+        HTTPException: If room creation or token generation fails.
+    """
+    rest = daily_helpers["rest"]
+    # Expire the room together with its token, so rooms that never get used
+    # don't stay in the Daily account
+    properties = DailyRoomProperties(exp=time.time() + TOKEN_EXPIRY_SECS)
+    base_url = daily_helpers.get("room_base_url")
+    if base_url:
+        # Once the domain is known, name the room ourselves so the token can be
+        # requested concurrently with the room creation
+        name = uuid.uuid4().hex
+        room, token = await asyncio.gather(
+            rest.create_room(DailyRoomParams(name=name, properties=properties)),
+            rest.get_token(f"{base_url}/{name}", expiry_time=TOKEN_EXPIRY_SECS),
+        )
+        if not room.url:
+            raise HTTPException(status_code=500, detail="Failed to create room")
+        room_url = room.url
+    else:
+        room = await rest.create_room(DailyRoomParams(properties=properties))
+        if not room.url:
+            raise HTTPException(status_code=500, detail="Failed to create room")
+        room_url = room.url
+        daily_helpers["room_base_url"] = room_url.rsplit("/", 1)[0]
+
+        token = await rest.get_token(room_url, expiry_time=TOKEN_EXPIRY_SECS)
+
+    if not token:
+        raise HTTPException(status_code=500, detail=f"Failed to get token for room: {room_url}")
+
+    return room_url, token
+
+
+async def _delete_room(room_url: str):
+    """Delete a pre-created room that will not be used.
+
+    Args:
+        room_url: URL of the room to delete
+    """
+    try:
+        await daily_helpers["rest"].delete_room_by_url(room_url)
+    except Exception as e:
+        logger.warning(f"Unable to delete unused Daily room {room_url}: {e}")
+
+
+def _is_stale(expires_at: float) -> bool:
+    """Whether a pooled token expires too soon to hand out."""
+    return expires_at - time.monotonic() <= TOKEN_EXPIRY_MARGIN_SECS
+
+
+async def _fill_room_pool(pool: collections.deque, taken: asyncio.Event):
+    """Keep the room pool topped up with fresh rooms and tokens.
+
+    Rooms are appended as they are created, so the oldest is always first.
+    Rooms whose token is about to expire are deleted and replaced.
+
+    Args:
+        pool: Deque of (room_url, token, expires_at) tuples
+        taken: Set whenever a room is taken from the pool
+    """
+    failures = 0
+    while True:
+        while pool and _is_stale(pool[0][2]):
+            room_url, _, _ = pool.popleft()
+            await _delete_room(room_url)
+
+        if len(pool) >= ROOM_POOL_SIZE:
+            # Wait until a room is taken or the oldest one needs replacing
+            taken.clear()
+            timeout = pool[0][2] - TOKEN_EXPIRY_MARGIN_SECS - time.monotonic()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(taken.wait(), timeout=max(timeout, 0))
+            continue
+
+        try:
+            room_url, token = await _create_room()
+        except Exception as e:
+            failures += 1
+            delay = min(ROOM_POOL_RETRY_SECS * 2 ** (failures - 1), ROOM_POOL_MAX_RETRY_SECS)
+            logger.warning(f"Unable to pre-create Daily room, retrying in {delay}s: {e}")
+            await asyncio.sleep(delay)
+            continue
+        failures = 0
+        pool.append((room_url, token, time.monotonic() + TOKEN_EXPIRY_SECS))
 
 
 async def create_room_and_token() -> tuple[str, str]:
     """Create a Daily room and generate an authentication token.
 
     This function checks for existing room URL and token in the environment variables.
-    If not found, it creates a new room using the Daily API and generates a token for it.
+    If not found, it takes a pre-created room from the room pool, falling back to
+    creating a new room using the Daily API and generating a token for it.
 
     Returns:
         tuple[str, str]: A tuple containing the room URL and the authentication token.
@@ -61,42 +293,79 @@ async def create_room_and_token() -> tuple[str, str]:
     Raises:
         HTTPException: If room creation or token generation fails.
     """
-    from pipecat.transports.services.helpers.daily_rest import DailyRoomParams
-
     room_url = os.getenv("DAILY_SAMPLE_ROOM_URL", None)
     token = os.getenv("DAILY_SAMPLE_ROOM_TOKEN", None)
-    if not room_url:
-        room = await daily_helpers["rest"].create_room(DailyRoomParams())
-        if not room.url:
-            raise HTTPException(status_code=500, detail="Failed to create room")
-        room_url = room.url
+    if room_url:
+        return room_url, token
 
-        token = await daily_helpers["rest"].get_token(room_url)
-        if not token:
-            raise HTTPException(status_code=500, detail=f"Failed to get token for room: {room_url}")
+    pool = daily_helpers.get("room_pool")
+    if pool:
+        # Skip rooms whose token would expire before the session gets going,
+        # the pool filler deletes and replaces them
+        for i, (room_url, token, expires_at) in enumerate(pool):
+            if not _is_stale(expires_at):
+                del pool[i]
+                daily_helpers["room_taken"].set()
+                return room_url, token
+        daily_helpers["room_taken"].set()
 
-    return room_url, token
+    return await _create_room()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """FastAPI lifespan manager that handles startup and shutdown tasks.
 
-    - Creates aiohttp session
+    - Creates aiohttp session with a tuned connection pool
     - Initializes Daily API helper
+    - Starts pre-creating Daily rooms in the background
+    - Pre-starts the warm bot process pool in multiproc mode
     - Cleans up resources on shutdown
     """
-    from pipecat.transports.services.helpers.daily_rest import DailyRESTHelper
-
-    aiohttp_session = aiohttp.ClientSession()
+    # Keep connections to the Daily API alive, so bursts of room/token requests
+    # reuse TLS sessions instead of handshaking again
+    connector = aiohttp.TCPConnector(
+        limit=64,
+        limit_per_host=32,
+        keepalive_timeout=75,
+        ttl_dns_cache=300,
+        enable_cleanup_closed=True,
+    )
+    aiohttp_session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=10, connect=3),
+    )
     daily_helpers["rest"] = DailyRESTHelper(
         daily_api_key=os.getenv("DAILY_API_KEY", ""),
         daily_api_url=os.getenv("DAILY_API_URL", "https://api.daily.co/v1"),
         aiohttp_session=aiohttp_session,
     )
+    # Pre-create rooms in the background, unless a fixed sample room is configured
+    # or there is no API key to create them with
+    room_pool_task = None
+    if (
+        not os.getenv("DAILY_SAMPLE_ROOM_URL")
+        and os.getenv("DAILY_API_KEY")
+        and ROOM_POOL_SIZE > 0
+    ):
+        daily_helpers["room_pool"] = collections.deque()
+        daily_helpers["room_taken"] = asyncio.Event()
+        room_pool_task = asyncio.create_task(
+            _fill_room_pool(daily_helpers["room_pool"], daily_helpers["room_taken"])
+        )
+    if _multiproc():
+        await _fill_warm_pool()
     yield
+    if room_pool_task:
+        # Let an in-flight room creation unwind before its session is closed
+        room_pool_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await room_pool_task
+        # Delete the rooms nobody took, so restarts don't leave them behind
+        pool = daily_helpers.pop("room_pool")
+        await asyncio.gather(*(_delete_room(room_url) for room_url, _, _ in pool))
     await aiohttp_session.close()
-    cleanup()
+    await cleanup()
 
 
 # Initialize FastAPI app with lifespan manager
@@ -119,18 +388,67 @@ async def start():
         tuple[str, str]: A tuple containing the room URL and token.
     """
     room_url, token = await create_room_and_token()
-    # Pass LOCAL_RUN=1 to the subprocess
-    proc = subprocess.Popen(
-        [f"LOCAL_RUN=1 python3 -m runner -u {room_url} -t {token}"],
-        shell=True,
-        bufsize=1,
-        cwd=os.path.dirname(os.path.abspath(__file__)),
-    )
-    bot_procs[proc.pid] = (proc, room_url)
+
+    if _multiproc():
+        proc = _take_warm()
+        if proc:
+            # Hand the session to an already warmed up runner
+            session = json.dumps({"room_url": room_url, "token": token}) + "\n"
+            try:
+                proc.stdin.write(session.encode())
+                await proc.stdin.drain()
+                proc.stdin.close()
+            except (BrokenPipeError, ConnectionResetError):
+                # The worker died after it was taken, start this bot cold instead
+                logger.warning(f"Warm bot process {proc.pid} exited, starting a new one")
+                proc = None
+        if not proc:
+            args = ["-u", room_url] + (["-t", token] if token else [])
+            # Pass LOCAL_RUN=1 to the subprocess
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-m",
+                "runner",
+                *args,
+                env={**os.environ, "LOCAL_RUN": "1"},
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+            )
+        bot_procs[proc.pid] = (proc, room_url)
+        reaper = asyncio.create_task(_reap(proc))
+        reapers.add(reaper)
+        reaper.add_done_callback(reapers.discard)
+
+        # Replace the runner just used and any that exited while waiting
+        await _fill_warm_pool()
+    else:
+        # Run the bot in this process, reusing the already imported pipecat
+        # services and assets instead of cold starting a new interpreter
+        session_args = DailySessionArguments(
+            room_url=room_url,
+            token=token,
+            body={},
+            session_id=None,
+        )
+        # Leave SIGINT to uvicorn, a bot's runner would otherwise take it over
+        task = asyncio.create_task(bot(session_args, handle_sigint=False))
+        bot_procs[id(task)] = (task, room_url)
+        task.add_done_callback(_on_bot_done)
 
     return room_url, token
 
 
+def _on_bot_done(task: asyncio.Task):
+    """Stop tracking an in-process bot once its session ends.
+
+    Args:
+        task: The finished bot task
+    """
+    bot_procs.pop(id(task), None)
+    # The bot already logs its own errors, just mark the exception as retrieved
+    if not task.cancelled():
+        task.exception()
+
+
 @app.get("/")
 async def start_agent():
     """A user endpoint for launching a bot agent and redirecting to the created room URL.
@@ -171,18 +489,32 @@ if __name__ == "__main__":
     # Parse command line arguments for server configuration
     default_host = os.getenv("HOST", "0.0.0.0")
     default_port = int(os.getenv("FAST_API_PORT", "7860"))
+    default_workers = int(os.getenv("WORKERS", "1"))
 
     parser = argparse.ArgumentParser(description="Daily Simple Chatbot Server")
     parser.add_argument("--host", type=str, default=default_host, help="Host address")
     parser.add_argument("--port", type=int, default=default_port, help="Port number")
     parser.add_argument("--reload", action="store_true", help="Reload code on change")
+    parser.add_argument(
+        "--workers", type=int, default=default_workers, help="Number of worker processes"
+    )
+    parser.add_argument(
+        "--multiproc",
+        action="store_true",
+        help="Run each bot in its own subprocess instead of in the server process",
+    )
 
     config = parser.parse_args()
 
+    # Read by the server app, which uvicorn imports separately from this script
+    if config.multiproc:
+        os.environ["BOT_MULTIPROC"] = "1"
+
     # Start the FastAPI server
     uvicorn.run(
         "server:app",
         host=config.host,
         port=config.port,
+        workers=config.workers,
         reload=config.reload,
     )
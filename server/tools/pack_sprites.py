@@ -0,0 +1,62 @@
+#
+# Copyright (c) 2024–2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Sprite pack builder.
+
+Decodes the robot animation PNGs once and writes their raw pixels to
+`assets/sprites.rawpack`, so the bot can load its frames without Pillow.
+
+The pack is a header followed by the concatenated raw frames:
+- magic (4 bytes), frame count, width, height (little-endian uint32)
+- image mode and format (8 bytes each, NUL padded)
+
+Run it again whenever the PNGs change.
+"""
+
+import os
+import struct
+
+from PIL import Image
+
+# Must match SPRITE_PACK_HEADER in bot.py
+SPRITE_PACK_HEADER = struct.Struct("<4sIII8s8s")
+SPRITE_PACK_MAGIC = b"SPRK"
+
+assets_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets")
+
+
+def main():
+    """Decode the sprite PNGs and write them to the sprite pack."""
+    paths = [f"{assets_dir}/robot0{i}.png" for i in range(1, 26)]
+    pack_path = f"{assets_dir}/sprites.rawpack"
+
+    frames = []
+    for path in paths:
+        with Image.open(path) as img:
+            frames.append((img.tobytes(), img.size, img.mode, img.format))
+
+    _, (width, height), mode, fmt = frames[0]
+    for image, size, frame_mode, _ in frames:
+        if size != (width, height) or frame_mode != mode:
+            raise Exception("All sprites must share the same size and mode")
+
+    # Write next to the pack and rename, so a running bot never reads a partial pack
+    tmp_path = f"{pack_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(
+            SPRITE_PACK_HEADER.pack(
+                SPRITE_PACK_MAGIC, len(frames), width, height, mode.encode(), fmt.encode()
+            )
+        )
+        for image, *_ in frames:
+            f.write(image)
+    os.replace(tmp_path, pack_path)
+
+    print(f"Wrote {len(frames)} {width}x{height} {mode} frames to {pack_path}")
+
+
+if __name__ == "__main__":
+    main()